@@ -9,9 +9,18 @@ import sys
 import subprocess
 import json
 import platform
+import argparse
+import hashlib
+from functools import lru_cache
 from pathlib import Path
 
 
+_IS_WINDOWS = platform.system() == "Windows"
+
+# `python -m venv --upgrade-deps` is only available from Python 3.9
+VENV_UPGRADES_DEPS = sys.version_info >= (3, 9)
+
+
 def print_step(message):
     """Print a formatted step message."""
     print(f"\n{'='*60}")
@@ -34,6 +43,25 @@ def print_info(message):
     print(f"ℹ {message}")
 
 
+def prompt(message, args, default=""):
+    """
+    Ask the user a question, or return the default when running unattended.
+    
+    Setup is unattended when --no-interactive is passed or stdin is not a TTY.
+    
+    Args:
+        message: Prompt to display
+        args: Parsed setup options
+        default: Answer used when not running interactively
+    
+    Returns:
+        str: The user's answer, or the default
+    """
+    if args.no_interactive or not sys.stdin.isatty():
+        return default
+    return input(message)
+
+
 def check_python_version():
     """
     Check if the Python version meets minimum requirements.
@@ -53,6 +81,7 @@ def check_python_version():
     return True
 
 
+@lru_cache(maxsize=None)
 def get_project_root():
     """
     Get the root directory of the project.
@@ -63,10 +92,13 @@ def get_project_root():
     return Path(__file__).parent.resolve()
 
 
-def create_virtual_environment():
+def create_virtual_environment(args):
     """
     Create a virtual environment for the project.
     
+    Args:
+        args: Parsed setup options
+    
     Returns:
         bool: True if successful, False otherwise
     """
@@ -77,7 +109,7 @@ def create_virtual_environment():
     
     if venv_path.exists():
         print_info(f"Virtual environment already exists at {venv_path}")
-        response = input("Recreate it? (y/N): ")
+        response = "y" if args.yes else prompt("Recreate it? (y/N): ", args)
         if response.lower() not in ['y', 'yes']:
             print_success("Using existing virtual environment")
             return True
@@ -89,10 +121,18 @@ def create_virtual_environment():
     
     try:
         print_info(f"Creating virtual environment at {venv_path}...")
-        subprocess.run(
-            [sys.executable, '-m', 'venv', str(venv_path)],
-            check=True
-        )
+        venv_cmd = [sys.executable, '-m', 'venv']
+        
+        # Link to the host interpreter instead of copying it
+        if not _IS_WINDOWS:
+            venv_cmd.append('--symlinks')
+        
+        # Let venv upgrade pip itself (Python 3.9+)
+        if VENV_UPGRADES_DEPS:
+            venv_cmd.append('--upgrade-deps')
+        
+        venv_cmd.append(str(venv_path))
+        subprocess.run(venv_cmd, check=True)
         print_success("Virtual environment created")
         return True
     except subprocess.CalledProcessError as e:
@@ -100,70 +140,115 @@ def create_virtual_environment():
         return False
 
 
-def get_venv_python():
+@lru_cache(maxsize=None)
+def venv_bin(name):
     """
-    Get the path to the Python interpreter in the virtual environment.
+    Get the path to an executable in the virtual environment.
+    
+    Args:
+        name: Executable name without extension (e.g. 'python', 'pip')
     
     Returns:
-        Path: Path to venv Python executable
+        Path: Path to the executable inside the venv
     """
-    project_root = get_project_root()
-    venv_path = project_root / "venv"
-    
-    if platform.system() == "Windows":
-        return venv_path / "Scripts" / "python.exe"
-    else:
-        return venv_path / "bin" / "python"
+    base = get_project_root() / "venv" / ("Scripts" if _IS_WINDOWS else "bin")
+    return base / (name + ".exe" if _IS_WINDOWS else name)
 
 
-def get_venv_pip():
+def get_pip_cache_dir():
     """
-    Get the path to pip in the virtual environment.
+    Get the directory pip should use as its persistent wheel cache.
+    
+    Honours $PIP_CACHE_DIR, otherwise defaults to ~/.cache/rapid-board/pip.
     
     Returns:
-        Path: Path to venv pip executable
+        Path: Path to the pip cache directory
     """
-    project_root = get_project_root()
-    venv_path = project_root / "venv"
+    default_cache = Path.home() / ".cache" / "rapid-board" / "pip"
+    return Path(os.environ.get("PIP_CACHE_DIR", default_cache))
+
+
+def get_requirements_sentinel():
+    """
+    Get the path of the file recording which requirements are installed.
     
-    if platform.system() == "Windows":
-        return venv_path / "Scripts" / "pip.exe"
-    else:
-        return venv_path / "bin" / "pip"
+    Returns:
+        Path: Path to the requirements hash sentinel inside the venv
+    """
+    return get_project_root() / "venv" / ".rapid-board-reqs.sha256"
 
 
-def install_dependencies():
+def install_dependencies(use_cache=True, force_reinstall=False):
     """
     Install required dependencies in the virtual environment.
     
+    When requirements.lock is present it is installed as-is with hash
+    checking and without dependency resolution; otherwise requirements.txt
+    is resolved and installed. Installation is skipped when the SHA256 of
+    the requirements file matches the hash recorded after the last
+    successful install into this venv.
+    
+    Args:
+        use_cache: If True, reuse wheels from the persistent pip cache
+        force_reinstall: If True, ignore the recorded requirements hash
+    
     Returns:
         bool: True if successful, False otherwise
     """
     print_step("Installing dependencies")
     
     project_root = get_project_root()
-    requirements_file = project_root / "requirements.txt"
-    pip_path = get_venv_pip()
+    lock_file = project_root / "requirements.lock"
+    pip_path = venv_bin('pip')
+    sentinel = get_requirements_sentinel()
+    
+    if lock_file.exists():
+        # Fully pinned and hashed, so pip's resolver can be skipped
+        requirements_file = lock_file
+        install_args = ['--no-deps', '--require-hashes']
+    else:
+        requirements_file = project_root / "requirements.txt"
+        install_args = []
     
     if not requirements_file.exists():
-        print_error(f"requirements.txt not found at {requirements_file}")
+        print_error(f"{requirements_file.name} not found at {requirements_file}")
         return False
     
+    digest = hashlib.sha256(requirements_file.read_bytes()).hexdigest()
+    
+    if force_reinstall:
+        if sentinel.exists():
+            sentinel.unlink()
+    elif sentinel.exists() and sentinel.read_text().strip() == digest:
+        print_success("Dependencies up to date (requirements cache hit)")
+        return True
+    
+    if use_cache:
+        cache_dir = get_pip_cache_dir()
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        cache_args = ['--cache-dir', str(cache_dir)]
+        print_info(f"Using pip cache at {cache_dir}")
+    else:
+        cache_args = ['--no-cache-dir']
+    
     try:
-        # Upgrade pip first
-        print_info("Upgrading pip...")
-        subprocess.run(
-            [str(pip_path), 'install', '--upgrade', 'pip'],
-            check=True,
-            capture_output=True
-        )
+        # Upgrade pip first, unless venv already did it via --upgrade-deps
+        if not VENV_UPGRADES_DEPS:
+            print_info("Upgrading pip...")
+            subprocess.run(
+                [str(pip_path), 'install', *cache_args, '--upgrade', 'pip'],
+                check=True,
+                stdout=subprocess.DEVNULL
+            )
         
-        # Install requirements
-        print_info("Installing packages from requirements.txt...")
+        # Install requirements, preferring prebuilt wheels over sdists
+        print_info(f"Installing packages from {requirements_file.name}...")
         subprocess.run(
-            [str(pip_path), 'install', '-r', str(requirements_file)],
+            [str(pip_path), 'install', *cache_args, '--prefer-binary',
+             *install_args, '-r', str(requirements_file)],
             check=True
         )
+        sentinel.write_text(digest + "\n")
         print_success("Dependencies installed successfully")
         return True
     except subprocess.CalledProcessError as e:
@@ -171,10 +256,60 @@ def install_dependencies():
         return False
 
 
-def create_config_file():
+def compile_lock_file():
+    """
+    Generate requirements.lock from requirements.txt using pip-tools.
+    
+    The lock pins every transitive dependency with hashes so later setups
+    can install it without running pip's resolver. pip-tools is installed
+    into the virtual environment if it is missing.
+    
+    Returns:
+        bool: True if successful, False otherwise
+    """
+    print_step("Compiling requirements.lock")
+    
+    project_root = get_project_root()
+    python_path = venv_bin('python')
+    
+    if not python_path.exists():
+        print_error("Virtual environment not found. Run setup first.")
+        return False
+    
+    try:
+        has_piptools = subprocess.run(
+            [str(python_path), '-c', 'import piptools'],
+            capture_output=True
+        ).returncode == 0
+        
+        if not has_piptools:
+            print_info("Installing pip-tools...")
+            subprocess.run(
+                [str(venv_bin('pip')), 'install', 'pip-tools'],
+                check=True,
+                stdout=subprocess.DEVNULL
+            )
+        
+        subprocess.run(
+            [str(python_path), '-m', 'piptools', 'compile', '--generate-hashes',
+             '-o', str(project_root / "requirements.lock"),
+             str(project_root / "requirements.txt")],
+            check=True
+        )
+        print_success("requirements.lock written")
+        return True
+    except subprocess.CalledProcessError as e:
+        print_error(f"Failed to compile requirements.lock: {e}")
+        return False
+
+
+def create_config_file(args):
     """
     Create the initial configuration file.
     
+    Args:
+        args: Parsed setup options
+    
     Returns:
         bool: True if successful, False otherwise
     """
@@ -185,7 +320,7 @@ def create_config_file():
     
     if config_path.exists():
         print_info("Configuration file already exists")
-        response = input("Overwrite it? (y/N): ")
+        response = "y" if args.yes else prompt("Overwrite it? (y/N): ", args)
         if response.lower() not in ['y', 'yes']:
             print_success("Keeping existing configuration")
             return True
@@ -194,18 +329,25 @@ def create_config_file():
     config = {
         "library_path": "library",
         "debug_mode": False,
-        "easyeda2kicad_path": None
+        "easyeda2kicad_path": None,
+        "use_hardlinks": True
     }
     
-    # Ask user for custom library path
-    print_info("Default library path: library/")
-    custom_path = input("Enter custom library path (or press Enter for default): ").strip()
+    # Ask user for custom library path unless given on the command line
+    if args.library_path is not None:
+        custom_path = args.library_path.strip()
+    else:
+        print_info("Default library path: library/")
+        custom_path = prompt("Enter custom library path (or press Enter for default): ", args).strip()
     if custom_path:
         config["library_path"] = custom_path
     
-    # Ask about debug mode
-    debug_response = input("Enable debug mode? (y/N): ").strip().lower()
-    config["debug_mode"] = debug_response in ['y', 'yes']
+    # Ask about debug mode unless given on the command line
+    if args.debug is not None:
+        config["debug_mode"] = args.debug
+    else:
+        debug_response = prompt("Enable debug mode? (y/N): ", args).strip().lower()
+        config["debug_mode"] = debug_response in ['y', 'yes']
     
     try:
         with open(config_path, 'w') as f:
@@ -254,15 +396,27 @@ def create_cli_wrapper():
     
     project_root = get_project_root()
     
-    if platform.system() == "Windows":
+    if _IS_WINDOWS:
         wrapper_path = project_root / "rb.bat"
         wrapper_content = f"""@echo off
-"{get_venv_python()}" -m src.cli %*
+"{venv_bin('python')}" -m src.cli %*
 """
     else:
         wrapper_path = project_root / "rb"
-        wrapper_content = f"""#!/bin/bash
-"{get_venv_python()}" -m src.cli "$@"
+        python_path = str(venv_bin('python'))
+        
+        # Point the shebang straight at the venv interpreter so each call
+        # skips starting bash. Shebangs can't contain whitespace and are
+        # length-limited by the kernel, so keep the bash launcher otherwise.
+        if len(python_path) < 120 and not any(c.isspace() for c in python_path):
+            wrapper_content = f"""#!{python_path}
+import sys
+from src.cli import main
+sys.exit(main())
+"""
+        else:
+            wrapper_content = f"""#!/bin/bash
+"{python_path}" -m src.cli "$@"
 """
     
     try:
@@ -270,7 +424,7 @@ def create_cli_wrapper():
             f.write(wrapper_content)
         
         # Make executable on Unix systems
-        if platform.system() != "Windows":
+        if not _IS_WINDOWS:
             os.chmod(wrapper_path, 0o755)
         
         print_success(f"CLI wrapper created at {wrapper_path}")
@@ -289,31 +443,34 @@ def verify_installation():
     """
     print_step("Verifying installation")
     
-    python_path = get_venv_python()
+    python_path = venv_bin('python')
+    
+    # Import the CLI and look up easyeda2kicad (next to the venv interpreter
+    # first, then on PATH) in a single interpreter start-up
+    check_script = (
+        "import os, shutil, sys, src.cli; "
+        "found = shutil.which('easyeda2kicad', path=os.path.dirname(sys.executable)) "
+        "or shutil.which('easyeda2kicad'); "
+        "print('OK' if found else 'OK_NO_E2K')"
+    )
     
     try:
-        # Try to import the main module
         result = subprocess.run(
-            [str(python_path), '-c', 'import src.cli; print("OK")'],
+            [str(python_path), '-c', check_script],
             capture_output=True,
             text=True,
-            timeout=5
+            timeout=5,
+            cwd=str(get_project_root())
         )
+        output = result.stdout.strip()
         
-        if result.returncode == 0 and "OK" in result.stdout:
+        if result.returncode == 0 and output.startswith("OK"):
             print_success("Module imports successful")
         else:
             print_error("Failed to import modules")
             return False
         
-        # Check easyeda2kicad
-        result = subprocess.run(
-            [str(python_path), '-c', 'import subprocess; subprocess.run(["easyeda2kicad", "--version"])'],
-            capture_output=True,
-            timeout=5
-        )
-        
-        if result.returncode == 0:
+        if output == "OK":
             print_success("easyeda2kicad is accessible")
         else:
             print_info("easyeda2kicad may not be installed (will be checked at runtime)")
@@ -328,7 +485,7 @@ def print_usage_instructions():
     """Print instructions for using the tool."""
     project_root = get_project_root()
     
-    if platform.system() == "Windows":
+    if _IS_WINDOWS:
         cli_command = ".\\rb.bat"
     else:
         cli_command = "./rb"
@@ -347,8 +504,73 @@ def print_usage_instructions():
     print("\n" + "="*60 + "\n")
 
 
-def main():
+def parse_args(argv=None):
+    """
+    Parse command line options for the setup script.
+    
+    Args:
+        argv: Argument list to parse (defaults to sys.argv[1:])
+    
+    Returns:
+        argparse.Namespace: Parsed options
+    """
+    parser = argparse.ArgumentParser(
+        description='Set up the KiCad Library Manager'
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Do not use the persistent pip wheel cache'
+    )
+    parser.add_argument(
+        '--force-reinstall',
+        action='store_true',
+        help='Reinstall dependencies even if requirements.txt is unchanged'
+    )
+    parser.add_argument(
+        '--compile-lock',
+        action='store_true',
+        help='Generate requirements.lock with pinned, hashed dependencies and exit'
+    )
+    parser.add_argument(
+        '--yes', '-y',
+        action='store_true',
+        help='Answer yes to recreating the venv and overwriting the config'
+    )
+    parser.add_argument(
+        '--no-interactive',
+        action='store_true',
+        help='Never prompt; use flag values or defaults (implied when stdin is not a TTY)'
+    )
+    parser.add_argument(
+        '--library-path',
+        metavar='PATH',
+        help='Library path to write to config.json (default: library)'
+    )
+    debug_group = parser.add_mutually_exclusive_group()
+    debug_group.add_argument(
+        '--debug',
+        dest='debug',
+        action='store_true',
+        default=None,
+        help='Enable debug mode in config.json'
+    )
+    debug_group.add_argument(
+        '--no-debug',
+        dest='debug',
+        action='store_false',
+        help='Disable debug mode in config.json'
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
     """Main setup function."""
+    args = parse_args(argv)
+    
+    if args.compile_lock:
+        return 0 if compile_lock_file() else 1
+    
     print("\n" + "="*60)
     print("  KiCad Library Manager - Setup")
     print("="*60)
@@ -358,15 +580,16 @@ def main():
         return 1
     
     # Create virtual environment
-    if not create_virtual_environment():
+    if not create_virtual_environment(args):
         return 1
     
     # Install dependencies
-    if not install_dependencies():
+    if not install_dependencies(use_cache=not args.no_cache,
+                                force_reinstall=args.force_reinstall):
         return 1
     
     # Create configuration
-    if not create_config_file():
+    if not create_config_file(args):
         return 1
     
     # Create library directory
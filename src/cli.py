@@ -7,15 +7,14 @@ Main entry point for the CLI tool.
 import argparse
 import sys
 import logging
+from functools import lru_cache
 
 from . import utils
-from . import component_manager
-from . import diagnostics
 
 
 def cmd_get(args) -> int:
     """
-    Handle the 'get' command to download a component.
+    Handle the 'get' command to download one or more components.
     
     Args:
         args: Parsed command line arguments
@@ -23,17 +22,30 @@ def cmd_get(args) -> int:
     Returns:
         int: Exit code (0 for success, 1 for failure)
     """
-    component_id = args.component_id
-    component_type = args.type
+    from . import component_manager
     
-    success, message = component_manager.get_component(component_id, component_type)
+    component_ids = args.component_ids
+    component_type = args.type
     
-    if success:
-        print(utils.format_success(message))
-        return 0
+    if len(component_ids) == 1:
+        success, message = component_manager.get_component(component_ids[0], component_type)
+        results = [(component_ids[0], success, message)]
+        
+        # Don't leave the deferred master library rebuild for interpreter exit
+        rebuild = component_manager.flush_rebuild()
+        if rebuild is not None and not rebuild[0]:
+            print(utils.format_error(rebuild[1]))
     else:
-        print(utils.format_error(message))
-        return 1
+        # Download together and rebuild the master libraries once
+        results = component_manager.get_components(component_ids, component_type)
+    
+    for _, success, message in results:
+        if success:
+            print(utils.format_success(message))
+        else:
+            print(utils.format_error(message))
+    
+    return 0 if all(success for _, success, _ in results) else 1
 
 
 def cmd_delete(args) -> int:
@@ -46,6 +58,8 @@ def cmd_delete(args) -> int:
     Returns:
         int: Exit code (0 for success, 1 for failure)
     """
+    from . import component_manager
+    
     component_id = args.component_id
     
     # Ask for confirmation unless --force is used
@@ -75,6 +89,8 @@ def cmd_list(args) -> int:
     Returns:
         int: Exit code (0 for success, 1 for failure)
     """
+    from . import component_manager
+    
     verbose = args.verbose
     components = component_manager.list_components(verbose=verbose)
     
@@ -125,6 +141,8 @@ def cmd_info(args) -> int:
     Returns:
         int: Exit code (0 for success, 1 for failure)
     """
+    from . import component_manager
+    
     component_id = args.component_id
     info = component_manager.get_component_info(component_id)
     
@@ -161,6 +179,8 @@ def cmd_diagnostics(args) -> int:
     Returns:
         int: Exit code (0 if all checks pass, 1 if any fail)
     """
+    from . import diagnostics
+    
     checks = diagnostics.run_diagnostics(verbose=args.verbose)
     diagnostics.print_diagnostic_report(checks)
     
@@ -179,6 +199,8 @@ def cmd_rebuild(args) -> int:
     Returns:
         int: Exit code (0 for success, 1 for failure)
     """
+    from . import component_manager
+    
     print("Rebuilding master library files...")
     
     success, message = component_manager.rebuild_master_libraries()
@@ -195,9 +217,13 @@ def cmd_rebuild(args) -> int:
         return 1
 
 
-def main():
+@lru_cache(maxsize=1)
+def _build_parser() -> argparse.ArgumentParser:
     """
-    Main entry point for the CLI.
+    Build the argument parser for the CLI.
+    
+    Returns:
+        argparse.ArgumentParser: Parser with all commands registered
     """
     # Create main parser
     parser = argparse.ArgumentParser(
@@ -228,11 +254,13 @@ def main():
     # Get command
     parser_get = subparsers.add_parser(
         'get',
-        help='Download and add a component to the library'
+        help='Download and add components to the library'
     )
     parser_get.add_argument(
-        'component_id',
-        help='EasyEDA component ID or LCSC part number (e.g., C12345)'
+        'component_ids',
+        nargs='+',
+        metavar='component_id',
+        help='EasyEDA component ID or LCSC part number (e.g., C12345); pass several to add them in one batch'
     )
     parser_get.add_argument(
         '--type',
@@ -300,6 +328,15 @@ def main():
     )
     parser_rebuild.set_defaults(func=cmd_rebuild)
     
+    return parser
+
+
+def main():
+    """
+    Main entry point for the CLI.
+    """
+    parser = _build_parser()
+    
     # Parse arguments
     args = parser.parse_args()
     
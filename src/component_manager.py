@@ -3,16 +3,75 @@ Component management module.
 Handles operations for getting, deleting, and listing components in the library.
 """
 
+import errno
 import logging
+import os
 import shutil
 from pathlib import Path
-from typing import List, Tuple, Optional
+from typing import Iterator, List, Tuple, Optional
 import json
 import re
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from operator import attrgetter
 
 from . import utils
 from . import easyeda_interface
 
+# Single-file index of the library so listing doesn't open every component
+INDEX_FILENAME = ".index.sqlite"
+INDEX_SCHEMA_VERSION = 2
+
+# Matches the parentheses that delimit KiCad s-expressions
+_PAREN_RE = re.compile(rb'[()]')
+
+# Footprint property of a symbol, up to and including its library prefix
+_FOOTPRINT_PROPERTY_RE = re.compile(rb'(property\s+"Footprint"\s+")[^":]+:')
+
+# Symbol names as they are defined or referenced in a .kicad_sym file, and
+# the "<parent>_<unit>_<style>" names KiCad gives a symbol's units
+_SYMBOL_NAME_RE = re.compile(rb'(\((?:symbol|extends)\s+")([^"]*)"')
+_SYMBOL_UNIT_RE = re.compile(rb'(.*)(_\d+_\d+)')
+
+# Constant framing of the master symbol library
+_SYM_HEADER = b'(kicad_symbol_lib (version 20211014) (generator rapid-board-library-manager)\n'
+_SYM_FOOTER = b')\n'
+
+# Worker threads used for per-file I/O while rebuilding master libraries
+_IO_WORKERS = 8
+
+# os.link failures that mean "copy instead" rather than a real error
+_LINK_FALLBACK_ERRNOS = frozenset(
+    code for code in (
+        errno.EXDEV, errno.EPERM, errno.EMLINK,
+        getattr(errno, "ENOTSUP", None), getattr(errno, "EOPNOTSUPP", None)
+    )
+    if code is not None
+)
+
+# Prefix of component directories renamed aside while they are deleted
+TRASH_PREFIX = ".trash-"
+
+# Libraries already swept for leftover deletes by this process; anything
+# renamed aside after that is being removed by this process itself
+_swept_libraries = set()
+
+# Record of which component files the master libraries were built from
+MASTER_INDEX_FILENAME = ".master_index.json"
+MASTER_INDEX_VERSION = 1
+
+# Debounced master library rebuilds: requests within this many seconds of
+# each other are coalesced into a single rebuild
+REBUILD_DEBOUNCE_SECONDS = 0.5
+_rebuild_pending = threading.Event()
+_rebuild_state_lock = threading.Lock()
+_rebuild_run_lock = threading.RLock()
+_last_rebuild_request = 0.0
+_rebuild_worker = None
+
 
 def get_component(component_id: str, component_type: str = "both") -> Tuple[bool, str]:
     """
@@ -27,24 +86,15 @@ def get_component(component_id: str, component_type: str = "both") -> Tuple[bool
     """
     logging.info(f"Getting component: {component_id}")
     
-    # Validate component ID
-    if not easyeda_interface.validate_component_id(component_id):
-        return False, f"Invalid component ID: {component_id}"
-    
     # Get library path
     library_path = utils.get_library_path()
     
-    # Ensure library directory exists
-    if not utils.ensure_directory_exists(library_path):
-        return False, "Failed to access library directory"
+    error = _prepare_new_component(component_id, library_path)
+    if error:
+        return False, error
     
     # Create component-specific directory
     component_dir = library_path / component_id
-    
-    # Check if component already exists
-    if component_dir.exists():
-        logging.warning(f"Component {component_id} already exists in library")
-        return False, f"Component {component_id} already exists. Use delete first to replace."
     print(f"downloading...")
     # Download the component
     success, message = easyeda_interface.download_component(
@@ -54,31 +104,130 @@ def get_component(component_id: str, component_type: str = "both") -> Tuple[bool
     )
     
     if success:
-        # Create metadata file for the component
-        metadata = {
-            "component_id": component_id,
-            "component_type": component_type,
-            "added_date": utils.get_current_timestamp()
-        }
-        _updateDirectory(component_id, library_path)
-        logging.info(f"Successfully added component {component_id}")
+        _add_downloaded_component(library_path, component_id, component_type)
         
-        # Rebuild master libraries
-        rebuild_master_libraries()
+        # Rebuild master libraries once this burst of changes settles
+        mark_rebuild_needed()
         
         return True, f"Component {component_id} added to library"
     else:
-        # Clean up failed download directory if it was created
-        if component_dir.exists():
-            try:
-                shutil.rmtree(component_dir)
-                logging.debug(f"Cleaned up failed download directory: {component_dir}")
-            except Exception as e:
-                logging.warning(f"Failed to clean up directory: {e}")
-        
+        _cleanup_failed_download(component_dir)
         return False, message
 
 
+def get_components(component_ids: List[str], component_type: str = "both") -> List[Tuple[str, bool, str]]:
+    """
+    Download and add several components to the library in one batch.
+    
+    Downloads run concurrently and the master libraries are rebuilt once at
+    the end instead of after every component.
+    
+    Args:
+        component_ids: EasyEDA component identifiers to add
+        component_type: Type of component to download ('symbol', 'footprint', or 'both')
+        
+    Returns:
+        List[Tuple[str, bool, str]]: (Component ID, success status, message) per component
+    """
+    logging.info(f"Getting {len(component_ids)} components")
+    
+    library_path = utils.get_library_path()
+    results = {}
+    to_download = []
+    
+    for component_id in dict.fromkeys(component_ids):
+        error = _prepare_new_component(component_id, library_path)
+        if error:
+            results[component_id] = (False, error)
+        else:
+            to_download.append(component_id)
+    
+    if to_download:
+        print(f"downloading {len(to_download)} components...")
+        downloads = easyeda_interface.download_components(to_download, library_path, component_type)
+        
+        for component_id in to_download:
+            success, message = downloads[component_id]
+            if success:
+                _add_downloaded_component(library_path, component_id, component_type)
+                results[component_id] = (True, f"Component {component_id} added to library")
+            else:
+                _cleanup_failed_download(library_path / component_id)
+                results[component_id] = (False, message)
+        
+        # Rebuild master libraries once for the whole batch
+        if any(results[component_id][0] for component_id in to_download):
+            rebuild_master_libraries()
+    
+    return [(component_id, *results[component_id]) for component_id in dict.fromkeys(component_ids)]
+
+
+def _prepare_new_component(component_id: str, library_path: Path) -> Optional[str]:
+    """
+    Check that a component can be downloaded into the library.
+    
+    Args:
+        component_id: EasyEDA component identifier
+        library_path: Path to the library directory
+        
+    Returns:
+        Optional[str]: Error message if the component can't be added, None otherwise
+    """
+    # Validate component ID
+    if not easyeda_interface.validate_component_id(component_id):
+        return f"Invalid component ID: {component_id}"
+    
+    # Ensure library directory exists
+    if not utils.ensure_directory_exists(library_path):
+        return "Failed to access library directory"
+    
+    # Clear out anything a previous run left half-deleted
+    _sweep_trash(library_path)
+    
+    # Check if component already exists
+    if (library_path / component_id).exists():
+        logging.warning(f"Component {component_id} already exists in library")
+        return f"Component {component_id} already exists. Use delete first to replace."
+    
+    return None
+
+
+def _add_downloaded_component(library_path: Path, component_id: str, component_type: str) -> None:
+    """
+    Record a freshly downloaded component in the library.
+    
+    Args:
+        library_path: Path to the library directory
+        component_id: Component identifier that was downloaded
+        component_type: Type of component that was downloaded
+    """
+    # Create metadata file for the component
+    metadata = {
+        "component_id": component_id,
+        "component_type": component_type,
+        "added_date": utils.get_current_timestamp()
+    }
+    _write_metadata(library_path / component_id, metadata)
+    _updateDirectory(component_id, library_path)
+    _index_component(library_path, component_id, metadata)
+    logging.info(f"Successfully added component {component_id}")
+
+
+def _cleanup_failed_download(component_dir: Path) -> None:
+    """
+    Remove the directory left behind by a failed download, if any.
+    
+    Args:
+        component_dir: Path to the component directory
+    """
+    if component_dir.exists():
+        try:
+            utils.fast_rmtree(component_dir)
+            logging.debug(f"Cleaned up failed download directory: {component_dir}")
+        except Exception as e:
+            logging.warning(f"Failed to clean up directory: {e}")
+
+
 def delete_component(component_id: str) -> Tuple[bool, str]:
     """
     Remove a component from the library.
@@ -104,9 +253,16 @@ def delete_component(component_id: str) -> Tuple[bool, str]:
         logging.warning(f"Component {component_id} not found in library")
         return False, f"Component {component_id} not found in library"
     
-    # Delete the component directory
+    # Clear out anything a previous run left half-deleted
+    _sweep_trash(library_path)
+    
+    # Move the component out of the library in one rename and remove its
+    # files in the background
     try:
-        shutil.rmtree(component_dir)
+        trash_dir = library_path / f"{TRASH_PREFIX}{component_id}-{uuid.uuid4().hex}"
+        os.rename(str(component_dir), str(trash_dir))
+        _remove_in_background(trash_dir)
+        _unindex_component(library_path, component_id)
         logging.info(f"Successfully deleted component {component_id}")
         
         # Rebuild master libraries
@@ -119,6 +275,81 @@ def delete_component(component_id: str) -> Tuple[bool, str]:
         return False, error_msg
 
 
+def clone_component(src_id: str, dst_id: str) -> Tuple[bool, str]:
+    """
+    Copy an existing component in the library under a new ID.
+    
+    Files are hard-linked where the filesystem allows it, so a clone takes
+    no extra space until one of the copies is rewritten.
+    
+    Args:
+        src_id: Component identifier to copy
+        dst_id: Component identifier for the new copy
+        
+    Returns:
+        Tuple[bool, str]: (Success status, descriptive message)
+    """
+    logging.info(f"Cloning component {src_id} to {dst_id}")
+    
+    if not utils.validate_component_name(src_id):
+        return False, f"Invalid component ID: {src_id}"
+    if not easyeda_interface.validate_component_id(dst_id):
+        return False, f"Invalid component ID: {dst_id}"
+    
+    library_path = utils.get_library_path()
+    src_dir = library_path / src_id
+    dst_dir = library_path / dst_id
+    
+    if not src_dir.is_dir():
+        return False, f"Component {src_id} not found in library"
+    if dst_dir.exists():
+        return False, f"Component {dst_id} already exists. Use delete first to replace."
+    
+    try:
+        try:
+            shutil.copytree(src_dir, dst_dir, copy_function=os.link)
+        except (shutil.Error, OSError) as e:
+            # Cross-device or no hard link support, fall back to copying
+            logging.debug(f"Hard-linking {src_id} failed ({e}), copying instead")
+            shutil.rmtree(dst_dir, ignore_errors=True)
+            shutil.copytree(src_dir, dst_dir, copy_function=shutil.copy2)
+        
+        # The master symbol library needs unique names, so the clone's
+        # symbols can't keep the source's
+        _rename_cloned_symbols(dst_dir, src_id, dst_id)
+    except Exception as e:
+        shutil.rmtree(dst_dir, ignore_errors=True)
+        error_msg = f"Failed to clone component {src_id}: {str(e)}"
+        logging.error(error_msg)
+        return False, error_msg
+    
+    # metadata.json may share an inode with the source, so replace it rather
+    # than rewriting it in place
+    metadata_path = dst_dir / "metadata.json"
+    metadata = {}
+    if metadata_path.exists():
+        try:
+            metadata = utils._loads(metadata_path.read_bytes())
+        except ValueError:
+            pass
+        metadata_path.unlink()
+    
+    metadata.update({
+        "component_id": dst_id,
+        "component_type": metadata.get("component_type", "both"),
+        "added_date": utils.get_current_timestamp()
+    })
+    _write_metadata(dst_dir, metadata)
+    _updateDirectory(dst_id, library_path)
+    _index_component(library_path, dst_id, metadata)
+    logging.info(f"Successfully cloned component {src_id} to {dst_id}")
+    
+    # Rebuild master libraries
+    rebuild_master_libraries()
+    
+    return True, f"Component {src_id} cloned to {dst_id}"
+
+
 def list_components(verbose: bool = False) -> List[dict]:
     """
     List all components in the library.
@@ -138,37 +369,74 @@ def list_components(verbose: bool = False) -> List[dict]:
         logging.warning("Library directory does not exist")
         return []
     
-    components = []
-    
-    # Iterate through library directory
-    for item in library_path.iterdir():
-        if item.is_dir():
-            component_info = {
-                "id": item.name,
-                "path": str(item)
-            }
-            
-            # Try to load metadata if it exists
-            metadata_path = item / "metadata.json"
-            if metadata_path.exists() and verbose:
-                try:
-                    with open(metadata_path, 'r') as f:
-                        metadata = json.load(f)
-                        component_info.update(metadata)
-                except Exception as e:
-                    logging.debug(f"Failed to load metadata for {item.name}: {e}")
-            
-            # Count files in component directory
-            file_count = len([f for f in item.iterdir() if f.is_file()])
-            component_info["file_count"] = file_count
-            
-            components.append(component_info)
-            logging.debug(f"Found component: {item.name}")
+    # Serve the listing from the index when it is in sync with the library,
+    # otherwise scan the library and refresh the index for the next listing
+    components = _list_indexed_components(library_path, verbose)
+    if components is None:
+        components = _list_and_index_components(library_path, verbose)
     
     logging.info(f"Found {len(components)} components in library")
     return components
 
 
+def _list_and_index_components(library_path: Path, verbose: bool) -> List[dict]:
+    """
+    List components by scanning the library, rewriting the index from the same scan.
+    
+    Args:
+        library_path: Path to the library directory
+        verbose: If True, include each component's metadata
+        
+    Returns:
+        List[dict]: Component information dictionaries
+    """
+    component_ids = _component_dir_names(library_path)
+    component_paths = [os.path.join(str(library_path), component_id) for component_id in component_ids]
+    
+    # Loading each component is independent I/O, so overlap it across threads
+    if len(component_paths) < 4:
+        results = [_read_component_files(path) for path in component_paths]
+    else:
+        with ThreadPoolExecutor(max_workers=min(16, len(component_paths))) as executor:
+            results = list(executor.map(_read_component_files, component_paths))
+    
+    components = []
+    rows = []
+    for component_id, component_path, (raw_metadata, file_count) in zip(component_ids, component_paths, results):
+        metadata = {}
+        if raw_metadata is not None:
+            try:
+                metadata = utils._loads(raw_metadata)
+            except ValueError as e:
+                logging.debug(f"Failed to load metadata for {component_id}: {e}")
+        
+        components.append(
+            _component_info(component_id, component_path, metadata if verbose else None, file_count)
+        )
+        rows.append((component_id, json.dumps(metadata), file_count))
+        logging.debug("Found component: %s", component_id)
+    
+    _write_index(library_path, rows)
+    return components
+
+
+def _write_metadata(component_dir: Path, metadata: dict) -> None:
+    """
+    Write a component's metadata.json.
+    
+    Args:
+        component_dir: Path to the component directory
+        metadata: Metadata dictionary to store
+    """
+    metadata_path = component_dir / "metadata.json"
+    
+    try:
+        with open(metadata_path, 'wb') as f:
+            f.write(utils._dumps(metadata))
+    except IOError as e:
+        logging.warning(f"Failed to write metadata for {component_dir.name}: {e}")
+
+
 def get_component_info(component_id: str) -> Optional[dict]:
     """
     Get detailed information about a specific component.
@@ -179,29 +447,29 @@ def get_component_info(component_id: str) -> Optional[dict]:
     Returns:
         Optional[dict]: Component information dictionary, or None if not found
     """
-    library_path = utils.get_library_path()
-    component_dir = library_path / component_id
+    component_dir = os.path.join(str(utils.get_library_path()), component_id)
     
-    if not component_dir.exists():
+    if not os.path.isdir(component_dir):
         return None
     
     component_info = {
         "id": component_id,
-        "path": str(component_dir)
+        "path": component_dir
     }
     
     # Load metadata
-    metadata_path = component_dir / "metadata.json"
-    if metadata_path.exists():
+    metadata_path = os.path.join(component_dir, "metadata.json")
+    if os.path.exists(metadata_path):
         try:
-            with open(metadata_path, 'r') as f:
-                metadata = json.load(f)
+            with open(metadata_path, 'rb') as f:
+                metadata = utils._loads(f.read())
                 component_info.update(metadata)
         except Exception as e:
             logging.debug(f"Failed to load metadata: {e}")
     
     # List files
-    files = [f.name for f in component_dir.iterdir() if f.is_file()]
+    with os.scandir(component_dir) as it:
+        files = [f.name for f in it if f.is_file(follow_symlinks=False)]
     component_info["files"] = files
     component_info["file_count"] = len(files)
     
@@ -218,9 +486,7 @@ def component_exists(component_id: str) -> bool:
     Returns:
         bool: True if component exists, False otherwise
     """
-    library_path = utils.get_library_path()
-    component_dir = library_path / component_id
-    return component_dir.exists() and component_dir.is_dir()
+    return os.path.isdir(os.path.join(str(utils.get_library_path()), component_id))
 
 
 def rebuild_master_libraries() -> Tuple[bool, str]:
@@ -228,6 +494,24 @@ def rebuild_master_libraries() -> Tuple[bool, str]:
     Rebuild the master symbol and footprint library files from all components.
     Creates consolidated library files that KiCad can easily import.
     
+    Only components whose files changed since the last rebuild are
+    re-extracted or re-linked; everything else is reused from the existing
+    master libraries as recorded in the master index.
+    
+    Returns:
+        Tuple[bool, str]: (Success status, descriptive message)
+    """
+    # One rebuild at a time; this one also covers any deferred request, and
+    # requests made while it runs schedule another
+    with _rebuild_run_lock:
+        _rebuild_pending.clear()
+        return _rebuild_master_libraries()
+
+
+def _rebuild_master_libraries() -> Tuple[bool, str]:
+    """
+    Rebuild the master libraries; callers must hold _rebuild_run_lock.
+    
     Returns:
         Tuple[bool, str]: (Success status, descriptive message)
     """
@@ -239,17 +523,38 @@ def rebuild_master_libraries() -> Tuple[bool, str]:
     if not library_path.exists():
         return False, "Library directory does not exist"
     
+    # The temporary files written below bump the library directory's mtime,
+    # which the library index uses to tell whether it is out of date
+    index_was_fresh = _index_is_fresh(library_path)
+    
     try:
-        # Rebuild symbol library
-        symbol_success, symbol_msg = _rebuild_symbol_library(library_path)
+        components = _scan_components(library_path)
+        previous_index = _load_master_index(library_path)
+        master_index = {"version": MASTER_INDEX_VERSION}
         
-        # Rebuild footprint library
-        footprint_success, footprint_msg = _rebuild_footprint_library(library_path)
+        # Rebuild the symbol and footprint libraries concurrently; both are
+        # dominated by waiting on file I/O
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            symbol_future = executor.submit(
+                _rebuild_symbol_library, library_path, components,
+                previous_index.get("symbol", {}), master_index
+            )
+            footprint_future = executor.submit(
+                _rebuild_footprint_library, library_path, components,
+                previous_index.get("footprint"), master_index
+            )
+            symbol_success, symbol_msg = symbol_future.result()
+            footprint_success, footprint_msg = footprint_future.result()
         
         if symbol_success and footprint_success:
+            _save_master_index(library_path, master_index)
+            if index_was_fresh:
+                _restamp_index(library_path)
             logging.info("Master libraries rebuilt successfully")
             return True, "Master libraries updated"
         else:
+            # Don't trust partially rebuilt libraries next time
+            _remove_master_index(library_path)
             messages = []
             if not symbol_success:
                 messages.append(f"Symbol library: {symbol_msg}")
@@ -258,179 +563,1025 @@ def rebuild_master_libraries() -> Tuple[bool, str]:
             return False, "; ".join(messages)
             
     except Exception as e:
+        _remove_master_index(library_path)
         error_msg = f"Failed to rebuild master libraries: {str(e)}"
         logging.error(error_msg)
         return False, error_msg
 
 
-def _rebuild_symbol_library(library_path: Path) -> Tuple[bool, str]:
+def mark_rebuild_needed() -> None:
+    """
+    Request a master library rebuild without running it immediately.
+    
+    The rebuild runs on a background thread once no further request has
+    arrived for REBUILD_DEBOUNCE_SECONDS, so a burst of changes costs a
+    single rebuild. Call flush_rebuild() to run it right away instead;
+    callers must do so before the interpreter exits, since the rebuild's
+    thread pools can't start during shutdown.
+    """
+    global _last_rebuild_request, _rebuild_worker
+    
+    with _rebuild_state_lock:
+        _last_rebuild_request = time.monotonic()
+        _rebuild_pending.set()
+        if _rebuild_worker is None:
+            _rebuild_worker = threading.Thread(target=_debounced_rebuild_worker, daemon=True)
+            _rebuild_worker.start()
+
+
+def flush_rebuild() -> Optional[Tuple[bool, str]]:
+    """
+    Run a pending master library rebuild now, if there is one.
+    
+    Returns:
+        Optional[Tuple[bool, str]]: Result of the rebuild, or None if no
+        rebuild was pending
+    """
+    return _run_pending_rebuild()
+
+
+def _debounced_rebuild_worker() -> None:
+    """
+    Wait for rebuild requests to go quiet, then run the pending rebuild.
+    """
+    global _rebuild_worker
+    
+    while True:
+        with _rebuild_state_lock:
+            if not _rebuild_pending.is_set():
+                _rebuild_worker = None
+                return
+            remaining = _last_rebuild_request + REBUILD_DEBOUNCE_SECONDS - time.monotonic()
+        
+        if remaining > 0:
+            time.sleep(remaining)
+        else:
+            _run_pending_rebuild()
+
+
+def _run_pending_rebuild() -> Optional[Tuple[bool, str]]:
+    """
+    Run the master library rebuild if one has been requested.
+    
+    Returns:
+        Optional[Tuple[bool, str]]: Result of the rebuild, or None if no
+        rebuild was pending
+    """
+    with _rebuild_run_lock:
+        if not _rebuild_pending.is_set():
+            return None
+        return rebuild_master_libraries()
+
+
+def _scan_components(library_path: Path) -> List[dict]:
+    """
+    Collect the symbol and footprint files of every component, in ID order.
+    
+    Each file is paired with a [name, mtime_ns, size] fingerprint used to
+    tell whether the component changed since the last rebuild.
+    
+    Args:
+        library_path: Path to the library directory
+        
+    Returns:
+        List[dict]: One dict per component with "id", "symbols" and
+        "footprints" lists of (Path, fingerprint) pairs
+    """
+    # Sort the directory entries themselves so no Path objects are built
+    # for the whole library up front
+    with os.scandir(library_path) as it:
+        component_dirs = [
+            entry for entry in it
+            if entry.is_dir()
+            and entry.name != "rapid-board-library-manager.pretty"
+            and not entry.name.startswith(TRASH_PREFIX)
+        ]
+    component_dirs.sort(key=attrgetter("name"))
+    
+    components = []
+    for component_dir in component_dirs:
+        symbol_files = []
+        footprint_files = []
+        
+        with os.scandir(component_dir.path) as it:
+            entries = list(it)
+        
+        for entry in entries:
+            if entry.name.startswith("."):
+                continue
+            if entry.name.endswith(".kicad_sym") and entry.is_file():
+                st = entry.stat()
+                symbol_files.append(
+                    (Path(entry.path), [entry.name, st.st_mtime_ns, st.st_size])
+                )
+            elif entry.name.endswith(".pretty") and entry.is_dir():
+                with os.scandir(entry.path) as sub:
+                    for fp_entry in sub:
+                        if (fp_entry.name.endswith(".kicad_mod")
+                                and not fp_entry.name.startswith(".")
+                                and fp_entry.is_file()):
+                            st = fp_entry.stat()
+                            footprint_files.append((
+                                Path(fp_entry.path),
+                                [f"{entry.name}/{fp_entry.name}", st.st_mtime_ns, st.st_size]
+                            ))
+        
+        logging.debug("Scanned %s: %d symbol files, %d footprint files",
+                      component_dir.name, len(symbol_files), len(footprint_files))
+        components.append({
+            "id": component_dir.name,
+            "symbols": symbol_files,
+            "footprints": footprint_files,
+        })
+    
+    return components
+
+
+def _fingerprints(files: List[Tuple[Path, list]]) -> List[list]:
+    """
+    Return the fingerprints of a component's files in a stable order.
+    
+    Args:
+        files: (Path, fingerprint) pairs from _scan_components
+        
+    Returns:
+        List[list]: Fingerprints sorted by file name
+    """
+    return sorted(fingerprint for _, fingerprint in files)
+
+
+def _load_master_index(library_path: Path) -> dict:
+    """
+    Load the record of what the master libraries were last built from.
+    
+    Args:
+        library_path: Path to the library directory
+        
+    Returns:
+        dict: The master index, or an empty dict if it is missing, unreadable
+        or from another version (forcing a full rebuild)
+    """
+    try:
+        with open(library_path / MASTER_INDEX_FILENAME, 'rb') as f:
+            master_index = utils._loads(f.read())
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        logging.debug(f"Ignoring unreadable master index: {e}")
+        return {}
+    
+    if not isinstance(master_index, dict) or master_index.get("version") != MASTER_INDEX_VERSION:
+        return {}
+    return master_index
+
+
+def _save_master_index(library_path: Path, master_index: dict) -> None:
+    """
+    Atomically write the master index.
+    
+    Args:
+        library_path: Path to the library directory
+        master_index: Index describing the master libraries just built
+    """
+    index_file = library_path / MASTER_INDEX_FILENAME
+    temp_file = library_path / (MASTER_INDEX_FILENAME + ".tmp")
+    try:
+        with open(temp_file, 'wb') as f:
+            f.write(utils._dumps(master_index))
+        os.replace(temp_file, index_file)
+    except OSError as e:
+        logging.warning(f"Failed to save master index: {e}")
+        _remove_master_index(library_path)
+
+
+def _remove_master_index(library_path: Path) -> None:
+    """
+    Delete the master index so the next rebuild starts from scratch.
+    
+    Args:
+        library_path: Path to the library directory
+    """
+    try:
+        os.unlink(library_path / MASTER_INDEX_FILENAME)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        logging.warning(f"Failed to remove master index: {e}")
+
+
+def _rebuild_symbol_library(library_path: Path, components: List[dict],
+                            previous: dict, master_index: dict) -> Tuple[bool, str]:
     """
     Rebuild the master symbol library file from all component symbols.
     
+    Symbols of components whose files are unchanged since the last rebuild
+    are copied byte for byte from the existing master library instead of
+    being parsed again.
+    
     Args:
         library_path: Path to the library directory
+        components: Component files as returned by _scan_components
+        previous: "symbol" section of the previous master index
+        master_index: Master index to record the new "symbol" section in
         
     Returns:
         Tuple[bool, str]: (Success status, message)
     """
     master_symbol_file = library_path / "rapid-board-library-manager.kicad_sym"
+    temp_symbol_file = library_path / "rapid-board-library-manager.kicad_sym.tmp"
     
-    # Start with KiCad symbol library header
-    library_content = ['(kicad_symbol_lib (version 20211014) (generator rapid-board-library-manager)\n']
+    # Spans in the old library are only usable if it is the file we wrote
+    previous_components = {}
+    try:
+        st = os.stat(master_symbol_file)
+        if previous.get("master") == [st.st_size, st.st_mtime_ns]:
+            previous_components = previous.get("components", {})
+    except FileNotFoundError:
+        pass
     
     symbol_count = 0
+    reused_count = 0
+    indexed_components = {}
+    old_master = open(master_symbol_file, 'rb') if previous_components else None
     
-    # Iterate through all component directories
-    for component_dir in sorted(library_path.iterdir()):
-        if not component_dir.is_dir():
-            continue
+    # Write the master symbol library as symbols are extracted, into a
+    # temporary file that replaces the old library once complete
+    try:
+        with open(temp_symbol_file, 'wb', buffering=1 << 20) as f, \
+                ThreadPoolExecutor(max_workers=_IO_WORKERS) as executor:
+            # Start with KiCad symbol library header
+            f.write(_SYM_HEADER)
             
-        # Look for symbol files
-        symbol_files = list(component_dir.glob("*.kicad_sym"))
-        component_id =component_dir.name
-        print(component_id)
-        
-        for symbol_file in symbol_files:
+            # Queue every changed component's symbol files for parsing up
+            # front, then write components in order as their results arrive
+            plan = []
+            for component in components:
+                component_id = component["id"]
+                fingerprints = _fingerprints(component["symbols"])
+                old_entry = previous_components.get(component_id)
+                if old_entry is not None and old_entry.get("files") == fingerprints:
+                    plan.append((component, fingerprints, old_entry, None))
+                else:
+                    futures = [
+                        executor.submit(_read_symbol_definitions, symbol_file, component_id)
+                        for symbol_file, _ in component["symbols"]
+                    ]
+                    plan.append((component, fingerprints, None, futures))
             
-            try:
-                with open(symbol_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    
-                # Extract symbol definitions (skip the header and footer)
-                # KiCad symbol files have format: (kicad_symbol_lib ... (symbol ...) ...)
-                # We want to extract just the (symbol ...) parts
-                symbol_defs = _extract_symbol_definitions(content, component_id)
+            for component, fingerprints, old_entry, futures in plan:
+                offset = f.tell()
                 
-                if symbol_defs:
-                    library_content.extend(symbol_defs)
-                    symbol_count += len(symbol_defs)
-                    logging.debug(f"Added {len(symbol_defs)} symbols from {symbol_file.name}")
-                    
-            except Exception as e:
-                logging.warning(f"Failed to process symbol file {symbol_file}: {e}")
-                continue
-    
-    # Close the library
-    library_content.append(')\n')
-    
-    # Write the master symbol library
-    try:
-        with open(master_symbol_file, 'w', encoding='utf-8') as f:
-            f.writelines(library_content)
+                if old_entry is not None:
+                    span_offset, span_length = old_entry["span"]
+                    old_master.seek(span_offset)
+                    data = old_master.read(span_length)
+                    if len(data) == span_length:
+                        f.write(data)
+                        count = old_entry["count"]
+                        symbol_count += count
+                        reused_count += 1
+                        indexed_components[component["id"]] = {
+                            "files": fingerprints,
+                            "span": [offset, span_length],
+                            "count": count,
+                        }
+                        continue
+                    # Old library was truncated; parse this component again
+                    futures = [
+                        executor.submit(_read_symbol_definitions, symbol_file, component["id"])
+                        for symbol_file, _ in component["symbols"]
+                    ]
+                
+                count = 0
+                complete = True
+                for future in futures:
+                    symbol_defs = future.result()
+                    if symbol_defs is None:
+                        complete = False
+                        continue
+                    for symbol in symbol_defs:
+                        f.write(symbol)
+                    count += len(symbol_defs)
+                symbol_count += count
+                
+                # Unreadable files are retried on the next rebuild
+                if complete:
+                    indexed_components[component["id"]] = {
+                        "files": fingerprints,
+                        "span": [offset, f.tell() - offset],
+                        "count": count,
+                    }
+            
+            # Close the library
+            f.write(_SYM_FOOTER)
+        
+        if old_master is not None:
+            old_master.close()
+            old_master = None
+        os.replace(temp_symbol_file, master_symbol_file)
+        
+        st = os.stat(master_symbol_file)
+        master_index["symbol"] = {
+            "master": [st.st_size, st.st_mtime_ns],
+            "components": indexed_components,
+        }
         
+        logging.debug("Reused symbols of %d unchanged components", reused_count)
         logging.info(f"Created master symbol library with {symbol_count} symbols")
         return True, f"Symbol library created ({symbol_count} symbols)"
         
     except Exception as e:
         return False, f"Failed to write symbol library: {str(e)}"
+    finally:
+        if old_master is not None:
+            old_master.close()
+
+
+def _read_symbol_definitions(symbol_file: Path, component_id: str) -> Optional[List[bytes]]:
+    """
+    Read one component symbol file and extract its symbol definitions.
+    
+    Args:
+        symbol_file: Path to the component's .kicad_sym file
+        component_id: ID of the component the file belongs to
+        
+    Returns:
+        Optional[List[bytes]]: Symbol definitions, or None if the file
+        couldn't be read
+    """
+    try:
+        content = symbol_file.read_bytes()
+        
+        # Match the newline translation text-mode reads used to apply
+        if b'\r' in content:
+            content = content.replace(b'\r\n', b'\n').replace(b'\r', b'\n')
+        
+        # Extract symbol definitions (skip the header and footer)
+        # KiCad symbol files have format: (kicad_symbol_lib ... (symbol ...) ...)
+        # We want to extract just the (symbol ...) parts
+        symbol_defs = list(_iter_symbol_definitions(content, component_id))
+        logging.debug("Added %d symbols from %s", len(symbol_defs), symbol_file.name)
+        return symbol_defs
+        
+    except Exception as e:
+        logging.warning(f"Failed to process symbol file {symbol_file}: {e}")
+        return None
 
 
-def _rebuild_footprint_library(library_path: Path) -> Tuple[bool, str]:
+def _rebuild_footprint_library(library_path: Path, components: List[dict],
+                               previous: Optional[dict], master_index: dict) -> Tuple[bool, str]:
     """
     Rebuild the master footprint library directory from all component footprints.
     KiCad footprint libraries are directories containing .kicad_mod files.
     
+    Footprints of components whose files are unchanged since the last
+    rebuild are left in place. Otherwise the desired footprints are diffed
+    against the directory's contents, and only missing or outdated ones
+    are placed and stale ones removed.
+    
     Args:
         library_path: Path to the library directory
+        components: Component files as returned by _scan_components
+        previous: "footprint" section of the previous master index, if any
+        master_index: Master index to record the new "footprint" section in
         
     Returns:
         Tuple[bool, str]: (Success status, message)
     """
     master_footprint_dir = library_path / "rapid-board-library-manager.pretty"
+    use_hardlinks = utils.load_config().get("use_hardlinks", True)
     
-    # Create/clear the master footprint directory
-    if master_footprint_dir.exists():
-        # Clear existing footprints but keep the directory
-        for item in master_footprint_dir.iterdir(): #FIXME why are we deleting everything out if we're just gonna add it back?
-            if item.is_file() and item.suffix == '.kicad_mod':
-                item.unlink()
+    # Index entries only describe the directory if it was built the same way
+    if previous is not None and previous.get("use_hardlinks") == use_hardlinks:
+        previous_components = previous.get("components", {})
     else:
-        master_footprint_dir.mkdir(exist_ok=True)
+        previous_components = {}
     
-    footprint_count = 0
+    master_footprint_dir.mkdir(exist_ok=True)
+    with os.scandir(master_footprint_dir) as it:
+        existing = {
+            item.name: item for item in it
+            if item.name.endswith('.kicad_mod') and item.is_file(follow_symlinks=False)
+        }
     
-    # Iterate through all component directories
-    for component_dir in sorted(library_path.iterdir()):
-        if not component_dir.is_dir() or component_dir.name == "rapid-board-library-manager.pretty":
-            continue
-            
-        # Look for footprint files
+    # Work out which footprints should exist, and which of those need
+    # (re)placing, then only touch the difference with what's there
+    desired = set()
+    footprint_jobs = []
+    kept_count = 0
+    indexed_components = {}
+    
+    for component in components:
+        component_id = component["id"]
+        fingerprints = _fingerprints(component["footprints"])
+        outputs = [
+            f"{component_id}_{file.stem}.kicad_mod" for file, _ in component["footprints"]
+        ]
+        desired.update(outputs)
         
-        footprint_folders = list(component_dir.glob("*.pretty"))
-        print(f"{footprint_folders}")
+        old_entry = previous_components.get(component_id)
+        if (old_entry is not None and old_entry.get("files") == fingerprints
+                and all(name in existing for name in outputs)):
+            kept_count += len(outputs)
+            indexed_components[component_id] = old_entry
+            continue
         
-        for footprint_folder in footprint_folders:
-            footprint_files = list(footprint_folder.glob("*.kicad_mod"))
-            for file in footprint_files:
-
-                try:
-                    # Create a unique footprint name using component ID
-                    component_id = component_dir.name
-                    new_footprint_name = f"{component_id}_{file.stem}.kicad_mod"
-                    destination = master_footprint_dir / new_footprint_name
-                
-                # Copy the footprint file
-                    shutil.copy2(file, destination)
-                    footprint_count += 1
-                    logging.debug(f"Copied footprint: {new_footprint_name}")
-                
-                except Exception as e:
-                    logging.warning(f"Failed to copy footprint {footprint_file}: {e}")
-                    continue
+        jobs = []
+        for (file, fingerprint), name in zip(component["footprints"], outputs):
+            entry = existing.get(name)
+            if entry is not None and _footprint_is_current(entry, file, fingerprint, use_hardlinks):
+                kept_count += 1
+            else:
+                jobs.append((file, master_footprint_dir / name))
+        footprint_jobs.append((component_id, fingerprints, outputs, jobs))
     
+    # Drop footprints no component provides any more
+    for name in existing.keys() - desired:
+        _unlink_footprint(master_footprint_dir / name)
+    
+    # Link (or copy) the new and changed footprint files in parallel
+    with ThreadPoolExecutor(max_workers=_IO_WORKERS) as executor:
+        results = list(executor.map(
+            lambda job: _copy_footprint(*job, use_hardlinks=use_hardlinks),
+            [job for _, _, _, jobs in footprint_jobs for job in jobs]
+        ))
+    
+    footprint_count = kept_count + sum(results)
+    position = 0
+    for component_id, fingerprints, outputs, jobs in footprint_jobs:
+        placed = results[position:position + len(jobs)]
+        position += len(jobs)
+        # Components with a failed copy are retried on the next rebuild
+        if all(placed):
+            indexed_components[component_id] = {"files": fingerprints, "outputs": outputs}
+    
+    master_index["footprint"] = {
+        "use_hardlinks": use_hardlinks,
+        "components": indexed_components,
+    }
+    
+    logging.debug("Placed %d new or changed footprints", len(results))
     logging.info(f"Created master footprint library with {footprint_count} footprints")
     return True, f"Footprint library created ({footprint_count} footprints)"
 
 
-def _extract_symbol_definitions(content: str, component_id: str) -> List[str]:
+def _footprint_is_current(entry: os.DirEntry, source: Path, fingerprint: list,
+                          use_hardlinks: bool) -> bool:
     """
-    Extract symbol definitions from a KiCad symbol library file.
+    Check whether a footprint already in the master library matches its source.
     
     Args:
-        content: Content of a .kicad_sym file
+        entry: Directory entry of the footprint in the master library
+        source: Component .kicad_mod file it should mirror
+        fingerprint: [name, mtime_ns, size] fingerprint of the source
+        use_hardlinks: Whether footprints are meant to be hard links
         
     Returns:
-        List[str]: List of symbol definition strings
-    """
-    symbols = []
-    
-    # Find all (symbol ...) blocks
-    # We need to match balanced parentheses
-    depth = 0
-    current_symbol = []
-    in_symbol = False
-
-    
-    i = 0
-    while i < len(content):
-        # Look for "(symbol " pattern
-        #if we find the start of a symbol and we aren't already in one
-        if (content[i:i+8] == "(symbol ") and (in_symbol == False):
-            in_symbol = True
-            depth = 1
-            current_symbol = ["(symbol "]
-            i += 8
-            continue
+        bool: True if the footprint can be left in place
+    """
+    try:
+        st = entry.stat(follow_symlinks=False)
+        source_st = os.stat(source)
+    except OSError:
+        return False
+    
+    linked = (st.st_ino, st.st_dev) == (source_st.st_ino, source_st.st_dev)
+    if linked:
+        return use_hardlinks
+    # Copies keep the source's mtime, so size and mtime identify them
+    return st.st_size == fingerprint[2] and st.st_mtime_ns == fingerprint[1]
+
+
+def _unlink_footprint(path: Path) -> None:
+    """
+    Remove a footprint from the master footprint library if it is present.
+    
+    Args:
+        path: Path of the footprint in the master library
+    """
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+
+def _copy_footprint(file: Path, destination: Path, use_hardlinks: bool = True) -> bool:
+    """
+    Place one component footprint into the master footprint library.
+    
+    Args:
+        file: Component .kicad_mod file
+        destination: Path of the footprint in the master library
+        use_hardlinks: If True, hard-link the file instead of copying it when possible
         
-        if in_symbol:
-            current_symbol.append(content[i])
-            
-            if content[i] == '(':
+    Returns:
+        bool: True if the footprint was placed, False otherwise
+    """
+    try:
+        try:
+            os.unlink(destination)
+        except FileNotFoundError:
+            pass
+        
+        if use_hardlinks:
+            _link_or_copy(file, destination)
+        else:
+            _copy_file(file, destination)
+        logging.debug("Copied footprint: %s", destination.name)
+        return True
+    except Exception as e:
+        logging.warning(f"Failed to copy footprint {file}: {e}")
+        return False
+
+
+def _link_or_copy(src: Path, dst: Path) -> None:
+    """
+    Hard-link a file into place, copying it if linking isn't possible.
+    
+    Args:
+        src: Existing file
+        dst: Destination path (must not exist)
+    """
+    try:
+        os.link(src, dst)
+    except OSError as e:
+        # Different filesystem, or one that doesn't allow (more) hard links
+        if e.errno not in _LINK_FALLBACK_ERRNOS:
+            raise
+        _copy_file(src, dst)
+
+
+def _copy_file(src: Path, dst: Path) -> None:
+    """
+    Copy a file and its metadata, letting the kernel move the data.
+    
+    Uses os.copy_file_range where available (Linux), which copies without
+    passing data through user space and can share extents on filesystems
+    with reflink support. Falls back to shutil.copy2 otherwise.
+    
+    Args:
+        src: Existing file
+        dst: Destination path
+    """
+    if not hasattr(os, "copy_file_range"):
+        shutil.copy2(src, dst)
+        return
+    
+    try:
+        with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+            remaining = os.fstat(fsrc.fileno()).st_size
+            while remaining > 0:
+                copied = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                if copied == 0:
+                    break
+                remaining -= copied
+        shutil.copystat(src, dst)
+    except OSError:
+        # Unsupported by this kernel or filesystem pair
+        shutil.copy2(src, dst)
+
+
+def _iter_symbol_definitions(content: bytes, component_id: str) -> Iterator[bytes]:
+    """
+    Extract symbol definitions from a KiCad symbol library file.
+    
+    Args:
+        content: Raw content of a .kicad_sym file
+        component_id: ID of the component, used to rename footprint references
+        
+    Yields:
+        bytes: Each symbol definition, with its footprint reference amended
+    """
+    # Find all (symbol ...) blocks by jumping between "(symbol " candidates
+    # and balancing parentheses with the regex engine instead of walking
+    # every character in Python
+    pos = 0
+    while True:
+        start = content.find(b"(symbol ", pos)
+        if start == -1:
+            break
+        
+        depth = 1
+        end = -1
+        for match in _PAREN_RE.finditer(content, start + 1):
+            if match.group() == b"(":
                 depth += 1
-            elif content[i] == ')':
+            else:
                 depth -= 1
-                
                 if depth == 0:
-                    # Complete symbol found
-                    symbol_text = ''.join(current_symbol)
-                    symbols.append(symbol_text + '\n')
-                    in_symbol = False
-                    current_symbol = []
+                    end = match.end()
+                    break
+        
+        if end == -1:
+            # Unbalanced trailing symbol, nothing more to extract
+            break
+        
+        yield _amendFootprintName(content[start:end] + b'\n', component_id)
+        pos = end
+
+
+def _rename_cloned_symbols(component_dir: Path, src_id: str, dst_id: str) -> None:
+    """
+    Give the symbols of a cloned component names distinct from the source's.
+    
+    The source ID in a symbol name is replaced by the clone's ID, and names
+    without it get the clone's ID appended. Unit symbols and "extends"
+    references follow their parent symbol.
+    
+    Args:
+        component_dir: Directory of the cloned component
+        src_id: Component identifier the clone was copied from
+        dst_id: Component identifier of the clone
+    """
+    for symbol_path in component_dir.glob("*.kicad_sym"):
+        content = symbol_path.read_bytes()
+        names = {match.group(2) for match in _SYMBOL_NAME_RE.finditer(content)}
+        
+        renames = {}
+        for name in names:
+            unit = _SYMBOL_UNIT_RE.fullmatch(name)
+            if unit is not None and unit.group(1) in names:
+                continue
+            if src_id.encode() in name:
+                renames[name] = name.replace(src_id.encode(), dst_id.encode())
+            else:
+                renames[name] = name + f"_{dst_id}".encode()
+        
+        def rename(match) -> bytes:
+            name = match.group(2)
+            if name in renames:
+                name = renames[name]
+            else:
+                unit = _SYMBOL_UNIT_RE.fullmatch(name)
+                if unit is not None and unit.group(1) in renames:
+                    name = renames[unit.group(1)] + unit.group(2)
+            return match.group(1) + name + b'"'
+        
+        # The file may share an inode with the source, so replace it rather
+        # than rewriting it in place
+        temp_path = symbol_path.with_name(symbol_path.name + ".tmp")
+        with open(temp_path, 'wb') as f:
+            f.write(_SYMBOL_NAME_RE.sub(rename, content))
+        os.replace(temp_path, symbol_path)
+
+
+def _remove_in_background(path: Path) -> threading.Thread:
+    """
+    Delete a directory tree on a background thread.
+    
+    The thread is not a daemon, so the interpreter finishes the removal
+    before exiting even if the caller has already returned.
+    
+    Args:
+        path: Directory to remove
         
-        i += 1
+    Returns:
+        threading.Thread: The started removal thread
+    """
+    thread = threading.Thread(
+        target=utils.fast_rmtree,
+        args=(path,),
+        kwargs={'ignore_errors': True}
+    )
+    thread.start()
+    return thread
 
-    symbols = _amendFootprintName(symbols, component_id)
-    return symbols
+
+def _sweep_trash(library_path: Path) -> None:
+    """
+    Remove component directories left behind by interrupted deletes.
+    
+    Only the first call per library in a process scans it.
+    
+    Args:
+        library_path: Path to the library directory
+    """
+    if library_path in _swept_libraries:
+        return
+    _swept_libraries.add(library_path)
+    
+    try:
+        with os.scandir(library_path) as it:
+            leftovers = [
+                entry.path for entry in it
+                if entry.name.startswith(TRASH_PREFIX) and entry.is_dir(follow_symlinks=False)
+            ]
+    except OSError as e:
+        logging.debug(f"Failed to scan library for leftover deletes: {e}")
+        return
+    
+    for path in leftovers:
+        logging.debug(f"Removing leftover directory: {path}")
+        _remove_in_background(Path(path))
+
+
+def _get_db(library_path: Path) -> sqlite3.Connection:
+    """
+    Open the library index database, creating its schema if needed.
+    
+    Args:
+        library_path: Path to the library directory
+        
+    Returns:
+        sqlite3.Connection: Connection to the library index
+    """
+    conn = sqlite3.connect(str(library_path / INDEX_FILENAME))
+    # Keep the rollback journal in memory so committing doesn't create and
+    # remove files in the library directory (which would bump its mtime)
+    conn.execute("PRAGMA journal_mode=MEMORY")
+    # Indexes written with an older schema are simply rebuilt from the library
+    if conn.execute("PRAGMA user_version").fetchone()[0] != INDEX_SCHEMA_VERSION:
+        with conn:
+            conn.execute("DROP TABLE IF EXISTS components")
+            conn.execute("DROP TABLE IF EXISTS index_state")
+            conn.execute(f"PRAGMA user_version = {INDEX_SCHEMA_VERSION}")
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS components ("
+        "id TEXT PRIMARY KEY, metadata TEXT, file_count INTEGER)"
+    )
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS index_state (key TEXT PRIMARY KEY, value)"
+    )
+    return conn
+
+
+def _mark_index_synced(conn: sqlite3.Connection, library_path: Path) -> None:
+    """
+    Record the library directory mtime the index now reflects.
+    
+    Args:
+        conn: Open connection to the library index
+        library_path: Path to the library directory
+    """
+    conn.execute(
+        "INSERT OR REPLACE INTO index_state (key, value) VALUES ('library_mtime', ?)",
+        (os.stat(library_path).st_mtime_ns,)
+    )
+
+
+def _mark_index_synced_if_complete(conn: sqlite3.Connection, library_path: Path) -> None:
+    """
+    Record the library directory mtime only if the index lists every component.
+    
+    An index that was already behind the library (e.g. components added by
+    hand) is left stale, so the next listing rescans instead of hiding them.
+    
+    Args:
+        conn: Open connection to the library index
+        library_path: Path to the library directory
+    """
+    indexed_ids = {row[0] for row in conn.execute("SELECT id FROM components")}
+    if indexed_ids == set(_component_dir_names(library_path)):
+        _mark_index_synced(conn, library_path)
+
+
+def _index_mtime_matches(conn: sqlite3.Connection, library_path: Path) -> bool:
+    """
+    Check whether the index was last synced at the library directory's current mtime.
+    
+    Args:
+        conn: Open connection to the library index
+        library_path: Path to the library directory
+        
+    Returns:
+        bool: True if the recorded mtime matches the directory's
+    """
+    row = conn.execute(
+        "SELECT value FROM index_state WHERE key = 'library_mtime'"
+    ).fetchone()
+    return row is not None and row[0] == os.stat(library_path).st_mtime_ns
+
+
+def _index_is_fresh(library_path: Path) -> bool:
+    """
+    Check whether the library index is in sync with the library directory.
+    
+    Args:
+        library_path: Path to the library directory
+        
+    Returns:
+        bool: True if the index exists and its recorded mtime is current
+    """
+    if not (library_path / INDEX_FILENAME).exists():
+        return False
+    
+    try:
+        conn = _get_db(library_path)
+        try:
+            return _index_mtime_matches(conn, library_path)
+        finally:
+            conn.close()
+    except (OSError, sqlite3.Error) as e:
+        logging.debug(f"Failed to read library index: {e}")
+        return False
+
+
+def _restamp_index(library_path: Path) -> None:
+    """
+    Mark the library index as in sync after changes that don't affect it.
+    
+    Args:
+        library_path: Path to the library directory
+    """
+    try:
+        conn = _get_db(library_path)
+        try:
+            with conn:
+                _mark_index_synced(conn, library_path)
+        finally:
+            conn.close()
+    except (OSError, sqlite3.Error) as e:
+        logging.warning(f"Failed to update library index: {e}")
+
+
+def _component_dir_names(library_path: Path) -> List[str]:
+    """
+    List the names of the component directories in the library.
+    
+    Args:
+        library_path: Path to the library directory
+        
+    Returns:
+        List[str]: Component directory names, in directory order
+    """
+    with os.scandir(library_path) as it:
+        return [
+            entry.name for entry in it
+            if entry.is_dir(follow_symlinks=False)
+            and entry.name != "rapid-board-library-manager.pretty"
+            and not entry.name.startswith(TRASH_PREFIX)
+        ]
+
+
+def _index_component(library_path: Path, component_id: str, metadata: dict) -> None:
+    """
+    Insert or update a component's row in the library index.
+    
+    Args:
+        library_path: Path to the library directory
+        component_id: Component identifier to index
+        metadata: Component metadata, as written to metadata.json
+    """
+    # Without an index the next listing scans the library and builds one
+    if not (library_path / INDEX_FILENAME).exists():
+        return
+    
+    try:
+        with os.scandir(library_path / component_id) as it:
+            file_count = sum(1 for f in it if f.is_file(follow_symlinks=False))
+        
+        conn = _get_db(library_path)
+        try:
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO components (id, metadata, file_count) "
+                    "VALUES (?, ?, ?)",
+                    (component_id, json.dumps(metadata), file_count)
+                )
+                _mark_index_synced_if_complete(conn, library_path)
+        finally:
+            conn.close()
+    except (OSError, sqlite3.Error) as e:
+        logging.warning(f"Failed to index component {component_id}: {e}")
+
+
+def _unindex_component(library_path: Path, component_id: str) -> None:
+    """
+    Remove a component's row from the library index.
+    
+    Args:
+        library_path: Path to the library directory
+        component_id: Component identifier to remove
+    """
+    if not (library_path / INDEX_FILENAME).exists():
+        return
+    
+    try:
+        conn = _get_db(library_path)
+        try:
+            with conn:
+                conn.execute("DELETE FROM components WHERE id = ?", (component_id,))
+                _mark_index_synced_if_complete(conn, library_path)
+        finally:
+            conn.close()
+    except (OSError, sqlite3.Error) as e:
+        logging.warning(f"Failed to remove {component_id} from index: {e}")
+
+
+def _write_index(library_path: Path, rows: List[tuple]) -> None:
+    """
+    Replace the contents of the library index.
+    
+    Args:
+        library_path: Path to the library directory
+        rows: (id, metadata JSON, file_count) for every component in the library
+    """
+    try:
+        conn = _get_db(library_path)
+        try:
+            with conn:
+                conn.execute("DELETE FROM components")
+                conn.executemany(
+                    "INSERT INTO components (id, metadata, file_count) VALUES (?, ?, ?)",
+                    rows
+                )
+                _mark_index_synced(conn, library_path)
+        finally:
+            conn.close()
+        logging.debug(f"Rebuilt library index with {len(rows)} components")
+    except (OSError, sqlite3.Error) as e:
+        logging.warning(f"Failed to rebuild library index: {e}")
+
+
+def _read_component_files(component_path: str) -> Tuple[Optional[bytes], int]:
+    """
+    Read a component's raw metadata and count its files.
+    
+    Args:
+        component_path: Path to the component directory
+        
+    Returns:
+        Tuple[Optional[bytes], int]: (metadata.json contents or None if it
+        couldn't be read, number of files in the directory)
+    """
+    try:
+        with open(os.path.join(component_path, "metadata.json"), 'rb') as f:
+            raw_metadata = f.read()
+    except OSError:
+        raw_metadata = None
+    
+    with os.scandir(component_path) as it:
+        file_count = sum(1 for f in it if f.is_file(follow_symlinks=False))
+    
+    return raw_metadata, file_count
+
+
+def _list_indexed_components(library_path: Path, verbose: bool) -> Optional[List[dict]]:
+    """
+    List components from the library index.
+    
+    Args:
+        library_path: Path to the library directory
+        verbose: If True, include each component's metadata
+        
+    Returns:
+        Optional[List[dict]]: Component information dictionaries, or None if
+        the index is missing or out of date with the library directory
+    """
+    if not (library_path / INDEX_FILENAME).exists():
+        return None
+    
+    try:
+        conn = _get_db(library_path)
+        try:
+            rows = conn.execute(
+                "SELECT id, metadata, file_count FROM components"
+            ).fetchall()
+            
+            if not _index_mtime_matches(conn, library_path):
+                # The mtime also moves when trash directories are removed or
+                # temporary files are renamed into place, so only give up on
+                # the index if the set of components actually changed
+                if set(_component_dir_names(library_path)) != {row[0] for row in rows}:
+                    logging.debug("Library index is out of date")
+                    return None
+                with conn:
+                    _mark_index_synced(conn, library_path)
+        finally:
+            conn.close()
+    except (OSError, sqlite3.Error) as e:
+        logging.debug(f"Failed to read library index: {e}")
+        return None
+    
+    return [
+        _component_info(component_id, os.path.join(str(library_path), component_id),
+                        utils._loads(metadata) if verbose else None, file_count)
+        for component_id, metadata, file_count in rows
+    ]
+
+
+def _component_info(component_id: str, component_path: str,
+                    metadata: Optional[dict], file_count: int) -> dict:
+    """
+    Build the dictionary list_components reports for one component.
+    
+    Args:
+        component_id: Component identifier
+        component_path: Path to the component directory
+        metadata: Component metadata to include, or None to leave it out
+        file_count: Number of files in the component directory
+        
+    Returns:
+        dict: Component information dictionary
+    """
+    component_info = {
+        "id": component_id,
+        "path": component_path
+    }
+    if metadata:
+        component_info.update(metadata)
+    component_info["file_count"] = file_count
+    return component_info
 
 
 def _updateDirectory(componentId, libraryPath: Path):
@@ -446,10 +1597,6 @@ def _updateDirectory(componentId, libraryPath: Path):
 
     logging.info("updated part directory")
 
-def _amendFootprintName(symbols: List, component_id):
-    content = "".join(symbols)
-
-    pattern = r'(property\s+"Footprint"\s+")[^":]+:'
-    replacement = r'\1' + f"rapid_board_lib:{component_id}_"
-    amended_content = re.sub(pattern, replacement, content)
-    return list(amended_content)
\ No newline at end of file
+def _amendFootprintName(content: bytes, component_id):
+    replacement = rb'\1' + f"rapid_board_lib:{component_id}_".encode('utf-8')
+    return _FOOTPRINT_PROPERTY_RE.sub(replacement, content)
\ No newline at end of file
@@ -4,6 +4,7 @@ Performs validation of setup, dependencies, and configuration.
 """
 
 import logging
+import os
 import sys
 from pathlib import Path
 from typing import List, Tuple
@@ -131,7 +132,8 @@ def check_library_directory() -> DiagnosticCheck:
             test_file.unlink()
             
             # Count components
-            component_count = len([d for d in library_path.iterdir() if d.is_dir()])
+            with os.scandir(library_path) as it:
+                component_count = sum(1 for entry in it if entry.is_dir())
             
             return DiagnosticCheck(
                 "Library Directory",
@@ -4,12 +4,30 @@ Handles all interactions with the easyEDA2kicad command-line tool.
 """
 
 import logging
+import re
 import subprocess
 import shutil
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 
 
+# Limit concurrent easyEDA2kicad processes so EasyEDA isn't hammered
+_MAX_PARALLEL_DOWNLOADS = 4
+
+# Any character not allowed in a component ID
+_INVALID_ID_RE = re.compile(r'[^A-Za-z0-9_-]')
+
+# easyEDA2kicad flags selecting what to download for each component type
+_TYPE_FLAGS = {
+    "symbol": ['--symbol'],
+    "footprint": ['--footprint'],
+    "both": ['--symbol', '--footprint'],
+}
+
+
+@lru_cache(maxsize=1)
 def check_easyeda2kicad_installed() -> bool:
     """
     Check if easyEDA2kicad is installed and accessible.
@@ -34,6 +52,7 @@ def check_easyeda2kicad_installed() -> bool:
         return False
 
 
+@lru_cache(maxsize=1)
 def get_easyeda2kicad_version() -> Optional[str]:
     """
     Get the installed version of easyEDA2kicad.
@@ -58,6 +77,14 @@ def get_easyeda2kicad_version() -> Optional[str]:
         return None
 
 
+def _reset_easyeda_cache() -> None:
+    """
+    Forget the cached easyEDA2kicad installation and version checks.
+    """
+    check_easyeda2kicad_installed.cache_clear()
+    get_easyeda2kicad_version.cache_clear()
+
+
 def download_component(component_id: str, output_dir: Path, component_type: str = "symbol") -> Tuple[bool, str]:
     """
     Download a component from EasyEDA using easyEDA2kicad.
@@ -90,12 +117,7 @@ def download_component(component_id: str, output_dir: Path, component_type: str
         ]
         
         # Add component type flag if needed
-        if component_type == "symbol":
-            cmd.append('--symbol')
-        elif component_type == "footprint":
-            cmd.append('--footprint')
-        elif component_type == "both":
-            cmd.extend(['--symbol', '--footprint'])
+        cmd.extend(_TYPE_FLAGS.get(component_type, []))
         
         logging.debug(f"Executing command: {' '.join(cmd)}")
         
@@ -125,6 +147,38 @@ def download_component(component_id: str, output_dir: Path, component_type: str
         return False, error_msg
 
 
+def download_components(component_ids: List[str], output_root: Path,
+                        component_type: str = "symbol") -> Dict[str, Tuple[bool, str]]:
+    """
+    Download several components from EasyEDA concurrently.
+    
+    easyEDA2kicad only accepts one LCSC ID per invocation, so one process is
+    run per component, but the downloads overlap instead of running back
+    to back.
+    
+    Args:
+        component_ids: EasyEDA component IDs to download
+        output_root: Directory in which each component gets its own subdirectory
+        component_type: Type of component to download (symbol, footprint, or both)
+        
+    Returns:
+        Dict[str, Tuple[bool, str]]: (Success status, message) keyed by component ID
+    """
+    if not check_easyeda2kicad_installed():
+        error = (False, "easyEDA2kicad is not installed or not accessible")
+        return {component_id: error for component_id in component_ids}
+    
+    if not component_ids:
+        return {}
+    
+    with ThreadPoolExecutor(max_workers=min(_MAX_PARALLEL_DOWNLOADS, len(component_ids))) as executor:
+        results = executor.map(
+            lambda component_id: download_component(component_id, output_root / component_id, component_type),
+            component_ids
+        )
+        return dict(zip(component_ids, results))
+
+
 def validate_component_id(component_id: str) -> bool:
     """
     Validate that a component ID is in a reasonable format.
@@ -146,7 +200,7 @@ def validate_component_id(component_id: str) -> bool:
         return False
     
     # Allow alphanumeric characters, hyphens, and underscores
-    if not all(c.isalnum() or c in ['-', '_'] for c in component_id):
+    if _INVALID_ID_RE.search(component_id) is not None:
         logging.error(f"Component ID contains invalid characters: {component_id}")
         return False
     
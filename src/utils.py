@@ -6,9 +6,68 @@ Handles configuration management, logging, and shared helper functions.
 import json
 import logging
 import os
+import re
+import shutil
+import subprocess
+import threading
 from pathlib import Path
-from typing import Dict, Any, Optional
+from types import MappingProxyType
+from typing import Dict, Any, Iterable, Mapping, Optional, Set, Tuple
 from datetime import datetime
+from functools import lru_cache
+
+# Use orjson for JSON (de)serialization (config, component metadata) when
+# it is installed
+try:
+    import orjson
+
+    def _dumps(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+
+    _loads = orjson.loads
+except ImportError:
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj, indent=2).encode()
+
+    _loads = json.loads
+
+
+# Fixed for the life of the process, so resolve them once
+_PROJECT_ROOT = Path(__file__).parent.parent.resolve()
+_CONFIG_PATH = _PROJECT_ROOT / "config.json"
+
+# Read-only template for get_default_config
+_DEFAULT_CONFIG: Mapping[str, Any] = MappingProxyType({
+    "library_path": "library",
+    "debug_mode": False,
+    "easyeda2kicad_path": None,  # Auto-detected during setup
+    "use_hardlinks": True
+})
+
+# Parsed config.json and the st_mtime_ns it was read at
+_CONFIG_CACHE: Optional[Tuple[int, Dict[str, Any]]] = None
+_CONFIG_LOCK = threading.Lock()
+
+# (level, format) that setup_logging last configured the root logger with
+_LOG_CONFIGURED: Optional[Tuple[int, str]] = None
+
+# Characters not allowed in component names
+_INVALID_NAME_CHARS = frozenset('/\\:*?"<>|')
+
+# A valid component name: no invalid characters, no leading '.' and no '..'
+_VALID_NAME_RE = re.compile(r'(?!\.)(?!.*\.\.)[^/\\:*?"<>|]+', re.DOTALL)
+
+# Directories this process has already ensured exist
+_DIR_EXISTS_CACHE: Set[Path] = set()
+
+# Prefixes for formatted status messages
+_OK = "✓ "
+_ERR = "✗ "
+_INFO = "ℹ "
+
+# Bound once to skip the attribute lookups on every timestamp
+_now = datetime.now
+_isoformat = datetime.isoformat
 
 
 def get_project_root() -> Path:
@@ -18,7 +77,7 @@ def get_project_root() -> Path:
     Returns:
         Path: Absolute path to the project root directory
     """
-    return Path(__file__).parent.parent.resolve()
+    return _PROJECT_ROOT
 
 
 def get_config_path() -> Path:
@@ -28,59 +87,119 @@ def get_config_path() -> Path:
     Returns:
         Path: Absolute path to config.json
     """
-    return get_project_root() / "config.json"
+    return _CONFIG_PATH
 
 
 def get_library_path() -> Path:
     """
     Get the path to the component library directory.
     
+    Returns:
+        Path: Absolute path to the library directory
+    """
+    # Only re-read the config when it has changed on disk
+    try:
+        config_mtime = os.stat(_CONFIG_PATH).st_mtime_ns
+    except OSError:
+        config_mtime = None
+    return _library_path_for(config_mtime)
+
+
+@lru_cache(maxsize=1)
+def _library_path_for(config_mtime: Optional[int]) -> Path:
+    """
+    Resolve the library directory for a given version of the config file.
+    
+    Args:
+        config_mtime: st_mtime_ns of config.json, or None if it doesn't exist
+        
     Returns:
         Path: Absolute path to the library directory
     """
     config = load_config()
     library_relative_path = config.get("library_path", "library")
-    return get_project_root() / library_relative_path
+    return _PROJECT_ROOT / library_relative_path
 
 
 def load_config() -> Dict[str, Any]:
     """
     Load configuration from config.json.
     
+    The parsed file is cached for as long as its mtime doesn't change.
+    
     Returns:
         Dict[str, Any]: Configuration dictionary with user settings
     """
+    global _CONFIG_CACHE
     config_path = get_config_path()
     
-    if not config_path.exists():
+    try:
+        mtime = os.stat(config_path).st_mtime_ns
+    except FileNotFoundError:
+        return get_default_config()
+    except OSError as e:
+        logging.warning(f"Failed to load config: {e}. Using defaults.")
         return get_default_config()
     
+    with _CONFIG_LOCK:
+        if _CONFIG_CACHE is not None and _CONFIG_CACHE[0] == mtime:
+            return dict(_CONFIG_CACHE[1])
+    
     try:
-        with open(config_path, 'r') as f:
-            return json.load(f)
-    except (json.JSONDecodeError, IOError) as e:
+        with open(config_path, 'rb') as f:
+            config = _loads(f.read())
+    except (ValueError, IOError) as e:
         logging.warning(f"Failed to load config: {e}. Using defaults.")
         return get_default_config()
+    
+    with _CONFIG_LOCK:
+        _CONFIG_CACHE = (mtime, config)
+    return dict(config)
 
 
 def save_config(config: Dict[str, Any]) -> bool:
     """
     Save configuration to config.json.
     
+    The file is replaced atomically, so a crash never leaves it truncated,
+    and left untouched if its contents wouldn't change.
+    
     Args:
         config: Dictionary containing configuration settings
         
     Returns:
         bool: True if save was successful, False otherwise
     """
+    global _CONFIG_CACHE
     config_path = get_config_path()
+    temp_path = config_path.with_name(config_path.name + ".tmp")
+    data = _dumps(config)
     
     try:
-        with open(config_path, 'w') as f:
-            json.dump(config, f, indent=2)
+        try:
+            with open(config_path, 'rb') as f:
+                unchanged = f.read() == data
+        except FileNotFoundError:
+            unchanged = False
+        
+        if not unchanged:
+            with open(temp_path, 'wb') as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, config_path)
+            # Saves within the mtime granularity wouldn't change the cache key
+            _library_path_for.cache_clear()
+        
+        with _CONFIG_LOCK:
+            _CONFIG_CACHE = (os.stat(config_path).st_mtime_ns, dict(config))
         return True
     except IOError as e:
         logging.error(f"Failed to save config: {e}")
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
         return False
 
 
@@ -89,13 +208,10 @@ def get_default_config() -> Dict[str, Any]:
     Get default configuration settings.
     
     Returns:
-        Dict[str, Any]: Default configuration dictionary
+        Dict[str, Any]: Default configuration dictionary (a fresh copy the
+        caller may modify)
     """
-    return {
-        "library_path": "library",
-        "debug_mode": False,
-        "easyeda2kicad_path": None  # Auto-detected during setup
-    }
+    return dict(_DEFAULT_CONFIG)
 
 
 def setup_logging(debug_mode: bool = False) -> None:
@@ -105,31 +221,51 @@ def setup_logging(debug_mode: bool = False) -> None:
     Args:
         debug_mode: If True, enable verbose debug logging; if False, show only important messages
     """
+    global _LOG_CONFIGURED
     log_level = logging.DEBUG if debug_mode else logging.INFO
     log_format = '%(levelname)s: %(message)s'
     
     if debug_mode:
         log_format = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
     
+    # Already configured this way, don't tear down and recreate the handlers
+    if _LOG_CONFIGURED == (log_level, log_format):
+        return
+    
     logging.basicConfig(
         level=log_level,
         format=log_format,
         force=True  # Override any existing configuration
     )
+    _LOG_CONFIGURED = (log_level, log_format)
+
+
+def reset_logging() -> None:
+    """
+    Forget the logging configuration so the next setup_logging call reapplies it.
+    """
+    global _LOG_CONFIGURED
+    _LOG_CONFIGURED = None
 
 
 def ensure_directory_exists(directory: Path) -> bool:
     """
     Ensure a directory exists, creating it if necessary.
     
+    Directories already ensured by this process are not checked again.
+    
     Args:
         directory: Path to the directory to check/create
         
     Returns:
         bool: True if directory exists or was created successfully, False otherwise
     """
+    if directory in _DIR_EXISTS_CACHE:
+        return True
+    
     try:
         directory.mkdir(parents=True, exist_ok=True)
+        _DIR_EXISTS_CACHE.add(directory)
         logging.debug(f"Directory ensured: {directory}")
         return True
     except OSError as e:
@@ -137,6 +273,52 @@ def ensure_directory_exists(directory: Path) -> bool:
         return False
 
 
+def ensure_directories_exist(directories: Iterable[Path]) -> Dict[Path, bool]:
+    """
+    Ensure several directories exist, creating any that are missing.
+    
+    Duplicates are only handled once, and parents are created before
+    their children so each mkdir finds its parent already in place.
+    
+    Args:
+        directories: Paths of the directories to check/create
+        
+    Returns:
+        Dict[Path, bool]: Whether each directory exists or was created successfully
+    """
+    results = {}
+    for directory in sorted(set(directories), key=lambda path: len(path.parts)):
+        results[directory] = ensure_directory_exists(directory)
+    return results
+
+
+def fast_rmtree(path: Path, ignore_errors: bool = False) -> None:
+    """
+    Remove a directory tree as quickly as the platform allows.
+    
+    On POSIX systems this runs the native rm -rf, which is much faster than
+    shutil.rmtree on large trees. Elsewhere, or if rm fails, it falls back
+    to shutil.rmtree.
+    
+    Args:
+        path: Directory to remove
+        ignore_errors: If True, ignore errors from the shutil.rmtree fallback
+    """
+    if os.name != "nt":
+        try:
+            subprocess.run(
+                ["rm", "-rf", "--", str(path)],
+                check=True,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE
+            )
+            return
+        except (OSError, subprocess.CalledProcessError) as e:
+            logging.debug(f"rm -rf failed for {path}, falling back to shutil.rmtree: {e}")
+    
+    shutil.rmtree(path, ignore_errors=ignore_errors)
+
+
 def validate_component_name(component_name: str) -> bool:
     """
     Validate that a component name is safe for filesystem operations.
@@ -150,18 +332,15 @@ def validate_component_name(component_name: str) -> bool:
     if not component_name:
         return False
     
-    # Check for invalid filesystem characters
-    invalid_chars = ['/', '\\', ':', '*', '?', '"', '<', '>', '|']
-    if any(char in component_name for char in invalid_chars):
-        logging.error(f"Component name contains invalid characters: {component_name}")
-        return False
+    if _VALID_NAME_RE.fullmatch(component_name) is not None:
+        return True
     
-    # Check for path traversal attempts
-    if '..' in component_name or component_name.startswith('.'):
+    # Only work out which rule failed when there's an error to report
+    if not _INVALID_NAME_CHARS.isdisjoint(component_name):
+        logging.error(f"Component name contains invalid characters: {component_name}")
+    else:
         logging.error(f"Component name contains invalid path elements: {component_name}")
-        return False
-    
-    return True
+    return False
 
 
 def format_success(message: str) -> str:
@@ -174,7 +353,7 @@ def format_success(message: str) -> str:
     Returns:
         str: Formatted success message
     """
-    return f"✓ {message}"
+    return _OK + message
 
 
 def format_error(message: str) -> str:
@@ -187,7 +366,7 @@ def format_error(message: str) -> str:
     Returns:
         str: Formatted error message
     """
-    return f"✗ {message}"
+    return _ERR + message
 
 
 def format_info(message: str) -> str:
@@ -200,7 +379,7 @@ def format_info(message: str) -> str:
     Returns:
         str: Formatted info message
     """
-    return f"ℹ {message}"
+    return _INFO + message
 
 
 def get_current_timestamp() -> str:
@@ -210,4 +389,4 @@ def get_current_timestamp() -> str:
     Returns:
         str: Current timestamp as ISO 8601 string
     """
-    return datetime.now().isoformat()
\ No newline at end of file
+    return _isoformat(_now())
\ No newline at end of file
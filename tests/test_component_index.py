@@ -0,0 +1,69 @@
+"""
+Tests for the on-disk library index used by list_components.
+"""
+
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from src import component_manager, easyeda_interface, utils
+
+
+def fake_download(component_id, component_dir, component_type="both"):
+    """Stand in for easyeda2kicad by writing a minimal symbol file."""
+    component_dir.mkdir(parents=True, exist_ok=True)
+    (component_dir / f"{component_id}.kicad_sym").write_text(
+        f'(kicad_symbol_lib (symbol "{component_id}"))\n'
+    )
+    return True, "ok"
+
+
+class LibraryIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        self.library_path = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.library_path, ignore_errors=True)
+
+        patches = {
+            (utils, "get_library_path"): lambda: self.library_path,
+            (easyeda_interface, "download_component"): fake_download,
+            (easyeda_interface, "check_easyeda2kicad_installed"): lambda: True,
+            (component_manager, "mark_rebuild_needed"): lambda: None,
+        }
+        for (target, name), replacement in patches.items():
+            patcher = mock.patch.object(target, name, replacement)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def add_by_hand(self, component_id):
+        fake_download(component_id, self.library_path / component_id)
+
+    def listed_ids(self):
+        return sorted(c["id"] for c in component_manager.list_components())
+
+    def test_get_on_library_without_index_keeps_existing_components(self):
+        self.add_by_hand("A1")
+        self.add_by_hand("B1")
+
+        success, _ = component_manager.get_component("C1")
+
+        self.assertTrue(success)
+        self.assertEqual(self.listed_ids(), ["A1", "B1", "C1"])
+
+    def test_components_added_by_hand_survive_later_changes(self):
+        component_manager.get_component("C1")
+        self.assertEqual(self.listed_ids(), ["C1"])
+
+        self.add_by_hand("X2")
+        component_manager.get_component("C5")
+        component_manager.delete_component("C1")
+
+        self.assertEqual(self.listed_ids(), ["C5", "X2"])
+        # Listed again from the rebuilt index
+        self.assertEqual(self.listed_ids(), ["C5", "X2"])
+
+
+if __name__ == "__main__":
+    unittest.main()